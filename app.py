@@ -0,0 +1,136 @@
+"""Streamlit UI for comparing two versions of an Act section by section."""
+
+import html
+
+import pandas as pd
+import streamlit as st
+
+from exporters import make_csv, make_excel
+from matcher import inline_diff, match_sections
+from parser import (
+    extract_text_from_pdf,
+    normalize,
+    split_sections,
+    units_as_records,
+)
+
+st.set_page_config(page_title="Act Comparison", layout="wide")
+st.title("Act Comparison")
+
+# One C-level pass instead of three chained .replace scans per body.
+_ESCAPE = str.maketrans({"<": "&lt;", ">": "&gt;", "\n": "<br>"})
+
+
+@st.cache_data(show_spinner=False)
+def _parse(file_bytes: bytes, name: str):
+    """Parse uploaded bytes into units, cached on file content.
+
+    Takes the upload's getvalue() bytes rather than a zero-copy
+    getbuffer() memoryview: st.cache_data keys on the argument's content,
+    which needs a stable hashable value, so the one bytes copy is the
+    price of content-addressed caching.
+    """
+    if name.lower().endswith(".pdf"):
+        text = extract_text_from_pdf(file_bytes)
+    else:
+        text = file_bytes.decode("utf-8", "ignore")
+    return split_sections(normalize(text))
+
+
+@st.cache_data(show_spinner=False)
+def _match(old_units, new_units):
+    """Match parsed units, cached so filter tweaks don't re-run the matcher."""
+    return match_sections(units_as_records(old_units), units_as_records(new_units))
+
+
+@st.cache_data(show_spinner=False)
+def _diff(old, new, old_words=None, new_words=None):
+    """Per-row diff HTML, cached so revisits of a page are free."""
+    return inline_diff(old, new, old_words, new_words)
+
+
+old_file = st.file_uploader("Old version", type=["pdf", "txt"])
+new_file = st.file_uploader("New version", type=["pdf", "txt"])
+
+if old_file and new_file:
+    old_units = _parse(old_file.getvalue(), old_file.name)
+    new_units = _parse(new_file.getvalue(), new_file.name)
+    matched = _match(old_units, new_units)
+    df = pd.DataFrame(matched)
+    # Arrow-backed strings make the filter's substring search a C-level
+    # scan instead of a per-cell pass over Python objects.
+    search_cols = [
+        "old_section_ref",
+        "new_section_ref",
+        "old_section_heading",
+        "new_section_heading",
+    ]
+    df[search_cols] = df[search_cols].astype("string[pyarrow]")
+
+    st.subheader("Summary")
+    counts = df["status"].value_counts()
+    for col, (status, n) in zip(st.columns(len(counts)), counts.items()):
+        col.metric(status, int(n))
+
+    st.subheader("Details")
+    statuses = sorted(df["status"].unique())
+    sel_status = st.multiselect("Status", statuses, default=statuses)
+    sel = st.text_input("Search refs and headings")
+    df_view = df[df["status"].isin(sel_status)]
+    if sel:
+        # Literal matching: the user pastes refs like "(1)" straight from
+        # the page, which would be a broken regex - and only the non-regex
+        # path uses Arrow's C substring scan on the pyarrow-backed columns.
+        mask = (
+            df_view["old_section_ref"]
+            .fillna("")
+            .str.contains(sel, case=False, regex=False)
+            | df_view["new_section_ref"]
+            .fillna("")
+            .str.contains(sel, case=False, regex=False)
+            | df_view["old_section_heading"]
+            .fillna("")
+            .str.contains(sel, case=False, regex=False)
+            | df_view["new_section_heading"]
+            .fillna("")
+            .str.contains(sel, case=False, regex=False)
+        )
+        df_view = df_view[mask]
+
+    # Render one page at a time so a rerun costs O(page), not O(rows).
+    PAGE_SIZE = 50
+    n_pages = max(1, -(-len(df_view) // PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1)
+    df_view = df_view.iloc[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+
+    # Browser-native <details> blocks collected into one st.markdown: a
+    # single Streamlit element instead of an expander + markdown mount per
+    # row, so the frontend gets one payload per page.
+    # (to_dict is one C-level conversion; iterrows would box every value
+    # into a fresh Series per row.)
+    parts = []
+    for r in df_view.to_dict("records"):
+        ref = r["old_section_ref"] or r["new_section_ref"]
+        heading = r["old_section_heading"] or r["new_section_heading"]
+        sub = r["old_subsection_ref"] or r["new_subsection_ref"]
+        summary = html.escape(f"{r['status']} — {ref}{sub} {heading}")
+        if r["status"] == "Added":
+            body = f"<ins>{(r['new_text'] or '').translate(_ESCAPE)}</ins>"
+        elif r["status"] == "Removed":
+            body = f"<del>{(r['old_text'] or '').translate(_ESCAPE)}</del>"
+        else:
+            body = _diff(
+                r["old_text"],
+                r["new_text"],
+                r.get("_old_words"),
+                r.get("_new_words"),
+            )
+        parts.append(
+            f"<details><summary>{summary}</summary><p>{body}</p></details>"
+        )
+    st.markdown("\n".join(parts), unsafe_allow_html=True)
+
+    st.subheader("Download")
+    c1, c2 = st.columns(2)
+    c1.download_button("Excel report", make_excel(matched), "comparison.xlsx")
+    c2.download_button("CSV report", make_csv(matched), "comparison.csv")
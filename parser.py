@@ -0,0 +1,342 @@
+"""Parse an Act's raw text into hierarchical section units."""
+
+import functools
+import hashlib
+import os
+import re
+import string
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+
+try:  # Optional faster backend; the fitz path below is always available.
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:  # Optional multi-pattern scanner for heading literals.
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+if ahocorasick is not None:
+    _AC = ahocorasick.Automaton()
+    for _word in ("chapter", "part", "schedule", "section", "sec."):
+        _AC.add_word(_word, _word)
+    _AC.make_automaton()
+else:
+    _AC = None
+
+# The three structured heading shapes in one alternation, so the line loop
+# classifies with a single match; all-caps headings are cheaper to detect
+# with the _is_shouty string predicate than with a regex that usually
+# fails late.
+# re.ASCII keeps \s/\d/\w/\b on the fast ASCII tables; the normalized
+# text has already had non-ASCII whitespace folded away.
+MASTER = re.compile(
+    r"(?P<chap>^\s*(?i:chapter|part|schedule)\s+(?i:[ivx]+|\d+)\b.*$)"
+    r"|(?P<sec>^\s*(?i:section|sec\.)\s+\d+[A-Za-z\-]*\b.*$)"
+    r"|(?P<num>^\s*\d+(?:\.\d+)*\s+[\w(].*$)",
+    re.A,
+)
+
+_SHOUTY_CHARS = frozenset(string.ascii_uppercase + " -&.,")
+
+
+def _is_shouty(s):
+    """True for all-caps heading lines like 'PRELIMINARY PROVISIONS'."""
+    if len(s) < 6 or s[0] not in string.ascii_uppercase:
+        return False
+    return all(c in _SHOUTY_CHARS for c in s)
+
+
+# One alternation instead of three separate matches per line. The roman
+# branch needs two or more characters so a lone (i)/(v)/(x) still counts
+# as a lettered item, as it did when the alpha pattern ran first.
+PAT_SUBSEC = re.compile(
+    r"^\s*\((?:\s*(?P<num>\d+)|\s*(?P<roman>[ivx]{2,})|\s*(?P<alpha>[a-z]))\s*\)"
+    r"\s+(?P<rest>.*)$",
+    re.A,
+)
+
+# Line boundaries without splitlines' one-str-per-line allocation.
+_LINE_RE = re.compile(r"([^\n]*)(?:\n|$)")
+
+# First characters that can open a MASTER heading: the chapter/part/
+# schedule/section keywords in either case, or a numeric heading.
+_HEAD_FIRST = frozenset("cpsCPS0123456789")
+
+
+# Content-addressed cache of extracted text, bounded by the total size of
+# the cached strings (one filing can be tens of MB of text) and evicted
+# least-recently-used first.
+_TEXT_CACHE = OrderedDict()
+_TEXT_CACHE_LOCK = threading.Lock()
+_TEXT_CACHE_LIMIT = 256 * 1024 * 1024
+
+
+def extract_text_from_pdf(data):
+    """Extract plain text from PDF bytes (or any bytes-like view).
+
+    Dispatches to pypdfium2's range extractor when it is installed and
+    falls back to PyMuPDF otherwise; both return pages joined by newlines.
+    Output is cached against a blake2b digest of the input, so re-running
+    a comparison over the same upload skips the parse entirely.
+    """
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    with _TEXT_CACHE_LOCK:
+        cached = _TEXT_CACHE.get(key)
+        if cached is not None:
+            _TEXT_CACHE.move_to_end(key)
+            return cached
+    text = _extract(data)
+    with _TEXT_CACHE_LOCK:
+        _TEXT_CACHE[key] = text
+        total = sum(len(t) for t in _TEXT_CACHE.values())
+        while total > _TEXT_CACHE_LIMIT and len(_TEXT_CACHE) > 1:
+            _, evicted = _TEXT_CACHE.popitem(last=False)
+            total -= len(evicted)
+    return text
+
+
+def _extract(data):
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return "\n".join(
+                page.get_textpage().get_text_range() for page in pdf
+            )
+        finally:
+            pdf.close()
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        n = doc.page_count
+        if n < 8:
+            return "\n".join(page.get_text("text") for page in doc)
+
+    # get_text releases the GIL inside MuPDF, so pages extract in
+    # parallel - but a fitz.Document is not thread-safe, so each worker
+    # opens its own document over the same buffer (via threading.local)
+    # rather than sharing one; ex.map preserves page order.
+    workers = min(os.cpu_count() or 1, 8, n)
+    tls = threading.local()
+    opened = []
+
+    def _page_text(i):
+        d = getattr(tls, "doc", None)
+        if d is None:
+            d = tls.doc = fitz.open(stream=data, filetype="pdf")
+            opened.append(d)
+        return d.load_page(i).get_text("text")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return "\n".join(ex.map(_page_text, range(n)))
+    finally:
+        for d in opened:
+            d.close()
+
+
+_TRANS = str.maketrans({"\xa0": " ", "\t": " ", "\r": "\n"})
+_SPACE_RUN = re.compile(r" {2,}")
+_NL_RUN = re.compile(r"\n{3,}")
+
+
+def normalize(text):
+    """Collapse the whitespace noise PDF extraction leaves behind.
+
+    The single-codepoint fixes (nbsp, tab, carriage return) are one
+    str.translate pass; the run-collapsing regexes only execute when a
+    cheap containment check says a run actually exists, so clean inputs
+    never enter the regex engine at all.
+    """
+    text = text.translate(_TRANS)
+    if "  " in text:
+        text = _SPACE_RUN.sub(" ", text)
+    if "\n\n\n" in text:
+        text = _NL_RUN.sub("\n\n", text)
+    return text.strip()
+
+
+# Compiled once; these run for every emitted unit, where the module-level
+# pattern's bound .search/.sub skips re's cache lookup and argument
+# re-parsing on each call.
+_RE_SEC_IN_HEADING = re.compile(r"(section|sec\.)\s+(\d+[A-Za-z\-]*)", re.I | re.A)
+_RE_NUM_HEADING = re.compile(r"^\s*(\d+(\.\d+)*)", re.A)
+_RE_CHP_HEADING = re.compile(r"^\s*(chapter|part)\s+([ivx]+|\d+)\b", re.I | re.A)
+_RE_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=8192)
+def _make_section_ref(heading):
+    """Pull a section number like '12A' or '3.2' out of a heading line.
+
+    Memoized: the same heading string recurs for every subsection unit it
+    covers and again in the backfill pass, and the function is pure.
+    """
+    m = _RE_SEC_IN_HEADING.search(heading)
+    if m:
+        return m.group(2)
+    m = _RE_NUM_HEADING.match(heading)
+    if m:
+        return m.group(1)
+    m = _RE_CHP_HEADING.match(heading)
+    if m:
+        return m.group(1).lower() + "-" + m.group(2).lower()
+    return ""
+
+
+@functools.lru_cache(maxsize=8192)
+def _make_id(heading, subsection_ref=""):
+    """Build a stable unit id from a heading and optional subsection ref."""
+    ref = _make_section_ref(heading)
+    if not ref:
+        ref = _RE_SLUG.sub("-", heading.lower()).strip("-")
+    return ref + subsection_ref
+
+
+def _split_subsections(body):
+    """Split a section body into (subsection_ref, text) chunks.
+
+    Markers like (1), (a) and (i) open a new chunk; nesting is tracked so
+    refs come out as '(1)', '(1)(a)', '(1)(a)(i)'. Lead-in text before the
+    first marker is returned with an empty ref.
+    """
+    # memchr-fast containment check: a body with no parenthesis at all
+    # (most statute sections) skips the per-line regex loop entirely.
+    if "(" not in body:
+        return [("", body)]
+    subs = []
+    ref = ""
+    num = ""
+    alpha = ""
+    buf = []
+    for ln in body.splitlines():
+        m = PAT_SUBSEC.match(ln)
+        if m:
+            if buf:
+                subs.append((ref, "\n".join(buf).strip()))
+            if m.group("num"):
+                num, alpha = m.group("num"), ""
+                ref = "(%s)" % num
+            elif m.group("alpha"):
+                alpha = m.group("alpha")
+                ref = ("(%s)" % num if num else "") + "(%s)" % alpha
+            else:
+                ref = (
+                    ("(%s)" % num if num else "")
+                    + ("(%s)" % alpha if alpha else "")
+                    + "(%s)" % m.group("roman")
+                )
+            buf = [m.group("rest")]
+            continue
+        buf.append(ln)
+    if buf:
+        subs.append((ref, "\n".join(buf).strip()))
+    return subs
+
+
+def split_sections(text):
+    """Split normalized Act text into a flat list of unit dicts.
+
+    Units come back as a columnar dict of parallel lists (one per field)
+    rather than a list of per-unit dicts: the six key strings are stored
+    once instead of once per unit, and pandas/NumPy consumers can wrap the
+    result without an AoS-to-SoA conversion. ``units_as_records`` restores
+    the row-dict view where needed. Each unit carries its position in the
+    hierarchy (chapter/part topic, SHOUTY subtopic, section heading and
+    ref, subsection ref) plus the body text for that unit.
+
+    Lines are walked as offsets from a single finditer pass and bodies are
+    sliced straight out of the document, so the only per-line string that
+    gets materialized is the candidate heading line itself.
+    """
+    # With pyahocorasick installed, one automaton pass over the lowered
+    # text finds every line that begins with a heading literal; MASTER
+    # then runs only on those lines (plus digit-led ones for the numeric
+    # branch) instead of on every line of the document.
+    candidates = None
+    if _AC is not None:
+        lowered = text.lower()
+        candidates = set()
+        for end, word in _AC.iter(lowered):
+            start = end - len(word) + 1
+            line_start = lowered.rfind("\n", 0, start) + 1
+            indent = lowered[line_start:start]
+            if not indent or indent.isspace():
+                candidates.add(line_start)
+
+    units = {
+        "id": [],
+        "topic": [],
+        "subtopic": [],
+        "section_ref": [],
+        "section_heading": [],
+        "subsection_ref": [],
+        "text": [],
+    }
+    topic = ""
+    subtopic = ""
+    current_heading = ""
+    body_start = 0
+
+    def flush_section(end):
+        # The pending body is one slice of the document; heading callers
+        # advance body_start past their own line afterwards.
+        body = text[body_start:end].strip()
+        if not current_heading and not body:
+            return
+        for sub_ref, sub_text in _split_subsections(body):
+            units["id"].append(_make_id(current_heading or subtopic or topic, sub_ref))
+            units["topic"].append(topic)
+            units["subtopic"].append(subtopic)
+            units["section_ref"].append(_make_section_ref(current_heading))
+            units["section_heading"].append(current_heading)
+            units["subsection_ref"].append(sub_ref)
+            units["text"].append(sub_text)
+
+    for lm in _LINE_RE.finditer(text):
+        stripped = lm.group(1).strip()
+        if not stripped:
+            continue
+        if candidates is not None:
+            run_master = lm.start() in candidates or stripped[0].isdigit()
+        else:
+            run_master = stripped[0] in _HEAD_FIRST
+        m = MASTER.match(stripped) if run_master else None
+        if m is None:
+            if _is_shouty(stripped):
+                flush_section(lm.start())
+                body_start = lm.end()
+                # Interned so every unit under this heading - and the same
+                # heading in the other document being compared - shares one
+                # str object instead of retaining per-parse copies.
+                subtopic = sys.intern(stripped)
+                current_heading = ""
+            # Plain body lines stay inside the pending range.
+        elif m.group("chap"):
+            flush_section(lm.start())
+            body_start = lm.end()
+            topic = sys.intern(stripped)
+            subtopic = ""
+            current_heading = ""
+        else:
+            flush_section(lm.start())
+            body_start = lm.end()
+            current_heading = sys.intern(stripped)
+    flush_section(len(text))
+
+    # Backfill refs for units whose own heading didn't yield one.
+    refs = units["section_ref"]
+    for i, r in enumerate(refs):
+        if not r:
+            refs[i] = _make_section_ref(units["subtopic"][i] or units["topic"][i])
+    return units
+
+
+def units_as_records(units):
+    """Convert the columnar split_sections output back to row dicts."""
+    cols = list(units)
+    return [dict(zip(cols, vals)) for vals in zip(*(units[c] for c in cols))]